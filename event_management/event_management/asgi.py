@@ -13,4 +13,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_management.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from events.streaming import SeatStreamRouter  # noqa: E402  (needs the app registry loaded)
+
+application = SeatStreamRouter(django_application)
@@ -66,12 +66,33 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'events.renderers.ORJSONRenderer',
+        'events.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'events.parsers.ORJSONParser',
+        'events.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'TEST_REQUEST_RENDERER_CLASSES': (
+        'rest_framework.renderers.MultiPartRenderer',
+        'events.renderers.ORJSONRenderer',
+        'events.renderers.MessagePackRenderer',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 2, 
 }
 
 
 
+# Pub/sub used to push seat availability to streaming clients. Use
+# 'events.broadcast.RedisBackend' when running several ASGI worker processes.
+EVENTS_BROADCAST_BACKEND = 'events.broadcast.InProcessBackend'
+EVENTS_BROADCAST_REDIS_URL = 'redis://localhost:6379/0'
+
 ROOT_URLCONF = 'event_management.urls'
 
 TEMPLATES = [
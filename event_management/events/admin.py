@@ -1,15 +1,21 @@
 from django.contrib import admin
 
-from .models import Event, EventParticipant, Feedback, Invitation
+from .models import Event, EventChange, EventParticipant, Feedback, Invitation
 
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('title', 'host', 'start_time', 'end_time', 'location', 'max_participants')
+    list_display = ('title', 'host', 'start_time', 'end_time', 'location', 'max_participants', 'participant_count')
     search_fields = ('title', 'host__username')
     list_filter = ('start_time', 'end_time')
 
 
+@admin.register(EventChange)
+class EventChangeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'event_id', 'action', 'changed_at')
+    list_filter = ('action',)
+
+
 @admin.register(EventParticipant)
 class EventParticipantAdmin(admin.ModelAdmin):
     list_display = ('user', 'event')
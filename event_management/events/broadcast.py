@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+import orjson
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One subscriber's mailbox. It only ever holds the latest message, so a slow
+    client skips intermediate updates instead of queueing them (coalescing),
+    and memory per subscriber stays constant however fast updates arrive.
+
+    Messages carry a monotonic version; anything not newer than what the
+    mailbox has already seen is dropped, so late publishes can't roll it back.
+    """
+
+    def __init__(self, topic):
+        self.topic = topic
+        self.closed = False
+        self.version = 0
+        self._latest = None
+        self._ready = asyncio.Event()
+
+    def push(self, message, version):
+        if version <= self.version:
+            return
+        self.version = version
+        self._latest = message
+        self._ready.set()
+
+    def skip_to(self, version):
+        """
+        Mark everything up to `version` as delivered, e.g. after a snapshot.
+        """
+        if version >= self.version:
+            self.version = version
+            self._latest = None
+            if not self.closed:
+                self._ready.clear()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def get(self):
+        """
+        Wait for the next message. Returns None once the subscription is closed.
+        """
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            if self.closed:
+                return None
+            message, self._latest = self._latest, None
+            if message is not None:
+                return message
+
+
+class BaseBackend:
+    """
+    Interface of a broadcast backend. `publish` may be called from any thread,
+    `subscribe`/`unsubscribe` from the event loop serving the subscribers.
+    """
+
+    def subscribe(self, topic):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def publish(self, topic, message, version):
+        raise NotImplementedError
+
+    def has_subscribers(self, topic):
+        return True
+
+
+class InProcessBackend(BaseBackend):
+    """
+    Fans messages out to subscriptions of the current process.
+
+    Publishes are coalesced per topic until the event loop runs the next
+    flush, so a burst of registrations costs one wake-up per subscriber.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+        self._pending = {}
+        self._loop = None
+
+    def subscribe(self, topic):
+        subscription = Subscription(topic)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.topic)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.topic]
+
+    def has_subscribers(self, topic):
+        return topic in self._subscriptions
+
+    def publish(self, topic, message, version):
+        with self._lock:
+            if self._loop is None or topic not in self._subscriptions:
+                return
+            if topic in self._pending and self._pending[topic][1] >= version:
+                return
+            schedule_flush = not self._pending
+            self._pending[topic] = (message, version)
+            loop = self._loop
+        if schedule_flush:
+            loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            deliveries = [
+                (list(self._subscriptions.get(topic, ())), message, version)
+                for topic, (message, version) in pending.items()
+            ]
+        for subscriptions, message, version in deliveries:
+            for subscription in subscriptions:
+                subscription.push(message, version)
+
+
+class RedisBackend(InProcessBackend):
+    """
+    Shares publishes between worker processes through Redis pub/sub.
+
+    Every process publishes to Redis and runs one listener that feeds what it
+    receives into its local subscriptions, so a registration handled by any
+    worker reaches subscribers on all of them. Configure the server with
+    `EVENTS_BROADCAST_REDIS_URL`.
+    """
+    channel_prefix = 'events:'
+    reconnect_delay = 1
+    # publish() runs inside the registration request; never let it hang there.
+    socket_timeout = 0.5
+    health_check_interval = 30
+
+    def __init__(self):
+        super().__init__()
+        self._url = getattr(settings, 'EVENTS_BROADCAST_REDIS_URL', 'redis://localhost:6379/0')
+        self._client = redis.Redis.from_url(
+            self._url, socket_timeout=self.socket_timeout, socket_connect_timeout=self.socket_timeout
+        )
+        self._listener = None
+
+    def subscribe(self, topic):
+        subscription = super().subscribe(topic)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return subscription
+
+    def has_subscribers(self, topic):
+        # Subscribers may live in other processes.
+        return True
+
+    def publish(self, topic, message, version):
+        # Live updates are best effort; never fail the registration over them.
+        try:
+            self._client.publish(self.channel_prefix + topic, orjson.dumps([topic, message, version]))
+        except redis.RedisError:
+            logger.exception("Could not publish %s to Redis", topic)
+
+    async def _listen(self):
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(
+                    self._url,
+                    socket_connect_timeout=self.socket_timeout,
+                    health_check_interval=self.health_check_interval,
+                )
+                async with client, client.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.channel_prefix + '*')
+                    async for message in pubsub.listen():
+                        if message['type'] == 'pmessage':
+                            self._deliver(message['data'])
+            except Exception:
+                logger.exception("Lost the Redis broadcast connection, reconnecting")
+                await asyncio.sleep(self.reconnect_delay)
+
+    def _deliver(self, data):
+        try:
+            topic, message, version = orjson.loads(data)
+            super().publish(topic, message, version)
+        except Exception:
+            logger.exception("Ignoring malformed broadcast message %r", data)
+
+
+_backend = None
+
+
+def get_backend():
+    """
+    Return the process-wide backend named by `EVENTS_BROADCAST_BACKEND`.
+    """
+    global _backend
+    if _backend is None:
+        backend_path = getattr(settings, 'EVENTS_BROADCAST_BACKEND', 'events.broadcast.InProcessBackend')
+        _backend = import_string(backend_path)()
+    return _backend
@@ -0,0 +1,79 @@
+class IdentityMap:
+    """
+    Request-scoped cache that hands out one instance per (model, pk).
+
+    Permissions, views and serializers handling the same request share it, so
+    an Event or User is read from the database at most once per request.
+    Foreign keys of newly loaded objects are wired to instances already in the
+    map (e.g. `event.host` becomes the authenticated user without a query).
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    def add(self, obj):
+        self._objects[(type(obj), obj.pk)] = obj
+        self._attach_related(obj)
+        return obj
+
+    def get(self, model, pk):
+        """
+        Return the cached instance, loading it on first use.
+        Raises `model.DoesNotExist` like `Model.objects.get()`.
+        """
+        key = (model, self._to_pk(model, pk))
+        if key not in self._objects:
+            obj = model._default_manager.filter(pk=key[1]).first()
+            self._objects[key] = obj
+            if obj is not None:
+                self._attach_related(obj)
+        obj = self._objects[key]
+        if obj is None:
+            raise model.DoesNotExist(f"{model.__name__} matching query does not exist.")
+        return obj
+
+    def get_or_none(self, model, pk):
+        try:
+            return self.get(model, pk)
+        except model.DoesNotExist:
+            return None
+
+    def load_related(self, obj, *field_names):
+        """
+        Resolve the given foreign keys of `obj` through the map, so a related
+        object that is already known (e.g. the request user) is not fetched.
+        """
+        for field_name in field_names:
+            field = obj._meta.get_field(field_name)
+            if not field.is_cached(obj):
+                field.set_cached_value(obj, self.get(field.related_model, getattr(obj, field.attname)))
+        return obj
+
+    def discard(self, model, pk):
+        self._objects.pop((model, self._to_pk(model, pk)), None)
+
+    def _to_pk(self, model, pk):
+        return model._meta.pk.to_python(pk)
+
+    def _attach_related(self, obj):
+        for field in obj._meta.concrete_fields:
+            if not field.many_to_one or field.is_cached(obj):
+                continue
+            related = self._objects.get((field.related_model, getattr(obj, field.attname)))
+            if related is not None:
+                field.set_cached_value(obj, related)
+
+
+def get_identity_map(request):
+    """
+    Return the IdentityMap of `request`, creating it on first use.
+    Accepts both DRF and plain Django requests.
+    """
+    http_request = getattr(request, '_request', request)
+    identity_map = getattr(http_request, '_identity_map', None)
+    if identity_map is None:
+        identity_map = http_request._identity_map = IdentityMap()
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            identity_map.add(user)
+    return identity_map
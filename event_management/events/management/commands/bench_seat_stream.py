@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+
+import orjson
+from django.core.management.base import BaseCommand
+
+from events.broadcast import InProcessBackend
+from events.streaming import SeatStreamRouter, seat_message, seat_topic
+
+
+class Command(BaseCommand):
+    help = "Load-test the seat stream with many idle subscribers in one worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=5000)
+        parser.add_argument('--events', type=int, default=10, help="Subscribers are spread over this many events.")
+        parser.add_argument('--updates', type=int, default=50, help="Registrations published per event.")
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options['subscribers'], options['events'], options['updates']))
+
+    async def run(self, subscribers, events, updates):
+        backend = InProcessBackend()
+        router = SeatStreamRouter(application=None, backend=backend)
+        disconnected = asyncio.Event()
+        all_full = asyncio.Event()
+        stats = {'delivered': 0, 'full': 0}
+
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            body = message.get('body', b'')
+            if not body.startswith(b'event:'):
+                return
+            stats['delivered'] += 1
+            if orjson.loads(body.split(b'data: ', 1)[1])['seats_remaining'] == 0:
+                stats['full'] += 1
+                if stats['full'] == subscribers:
+                    all_full.set()
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tasks = [
+            asyncio.ensure_future(router.stream(
+                backend.subscribe(seat_topic(i % events)), seat_message(i % events, 0, updates, 0), receive, send
+            ))
+            for i in range(subscribers)
+        ]
+        await asyncio.sleep(0.5)
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+        tracemalloc.stop()
+
+        # Publish from another thread, like the registration view does.
+        def publish():
+            for count in range(1, updates + 1):
+                for event_id in range(events):
+                    backend.publish(seat_topic(event_id), seat_message(event_id, count, updates, count), count)
+
+        started = time.perf_counter()
+        threading.Thread(target=publish).start()
+        await asyncio.wait_for(all_full.wait(), 60)
+        elapsed = time.perf_counter() - started
+
+        disconnected.set()
+        await asyncio.gather(*tasks)
+
+        self.stdout.write(f"subscribers:            {subscribers} over {events} events")
+        self.stdout.write(f"memory per subscriber:  {per_subscriber / 1024:.1f} KiB")
+        self.stdout.write(f"published updates:      {updates * events}")
+        self.stdout.write(f"messages delivered:     {stats['delivered']} (incl. {subscribers} initial, rest coalesced)")
+        self.stdout.write(f"time to final state:    {elapsed * 1000:.1f} ms")
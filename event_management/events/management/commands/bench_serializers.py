@@ -0,0 +1,57 @@
+import timeit
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+from rest_framework.renderers import JSONRenderer
+
+from events.models import Event, EventParticipant
+from events.renderers import MessagePackRenderer, ORJSONRenderer
+from events.serializers import EventParticipantSerializer, EventSerializer
+
+
+class Command(BaseCommand):
+    help = "Benchmark rendering of EventSerializer and EventParticipantSerializer output."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1000, help="Number of objects per list.")
+        parser.add_argument('--repeat', type=int, default=20, help="Renders per measurement.")
+
+    def handle(self, *args, **options):
+        size = options['size']
+        repeat = options['repeat']
+
+        # Unsaved instances, so the benchmark needs no database.
+        host = User(id=1, username='host', email='host@example.com')
+        start = now()
+        events = [
+            Event(
+                id=i, title=f"Event {i}", description="lorem ipsum " * 50, host=host,
+                start_time=start, end_time=start + timedelta(hours=2),
+                location="Berlin", max_participants=100, created_at=start,
+            )
+            for i in range(size)
+        ]
+        participants = [
+            EventParticipant(
+                id=i, event=events[0],
+                user=User(id=i, username=f"user{i}", email=f"user{i}@example.com"),
+                joined_at=start,
+            )
+            for i in range(size)
+        ]
+
+        payloads = {
+            'EventSerializer': EventSerializer(events, many=True).data,
+            'EventParticipantSerializer': EventParticipantSerializer(participants, many=True).data,
+        }
+        renderers = [JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()]
+
+        for name, data in payloads.items():
+            self.stdout.write(f"{name} x {size}")
+            for renderer in renderers:
+                seconds = timeit.timeit(lambda: renderer.render(data), number=repeat) / repeat
+                self.stdout.write(
+                    f"  {type(renderer).__name__:<20} {seconds * 1000:8.2f} ms  {len(renderer.render(data)):>9} bytes"
+                )
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_participant_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventParticipant = apps.get_model('events', 'EventParticipant')
+    participants = (
+        EventParticipant.objects.filter(event=models.OuterRef('pk'))
+        .values('event')
+        .annotate(count=models.Count('id'))
+        .values('count')
+    )
+    Event.objects.update(participant_count=Coalesce(models.Subquery(participants), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_participant_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('participant_count__lt', models.F('max_participants'))), fields=['id'], name='event_has_seats_idx'),
+        ),
+    ]
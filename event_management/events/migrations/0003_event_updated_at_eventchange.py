@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_event_changes(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventChange = apps.get_model('events', 'EventChange')
+    batch = []
+    for event_id in Event.objects.order_by('id').values_list('id', flat=True).iterator():
+        batch.append(EventChange(event_id=event_id, action='CREATED'))
+        if len(batch) == 1000:
+            EventChange.objects.bulk_create(batch)
+            batch = []
+    EventChange.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_participant_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name='EventChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.BigIntegerField(db_index=True)),
+                ('action', models.CharField(choices=[('CREATED', 'Created'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], max_length=10)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_event_changes, migrations.RunPython.noop),
+    ]
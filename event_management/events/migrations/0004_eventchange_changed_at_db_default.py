@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:59
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_updated_at_eventchange'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventchange',
+            name='changed_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now()),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Now
 
 
 class Event(models.Model):
@@ -12,11 +13,69 @@ class Event(models.Model):
     end_time = models.DateTimeField()
     location = models.CharField(max_length=255)
     max_participants = models.IntegerField()
+    participant_count = models.IntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(participant_count__lt=models.F("max_participants")),
+                name="event_has_seats_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # participant_count is only changed by the F() updates in signals.py;
+        # a plain save of an instance loaded earlier must not write back a
+        # stale count over concurrent registrations.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "participant_count" and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def seats_remaining(self):
+        return max(self.max_participants - self.participant_count, 0)
+
+
+class EventChange(models.Model):
+    """
+    Change log behind the delta-sync feed. The auto-increment id is the feed
+    cursor; each event keeps only its latest row, so deleted events remain as
+    DELETED tombstones and the table never holds more than one row per event.
+    Ids are handed out at insert time, not commit time, so the feed only
+    serves rows older than a commit-lag window (see EventChangesView).
+    """
+    ACTION_CHOICES = [
+        ("CREATED", "Created"),
+        ("UPDATED", "Updated"),
+        ("DELETED", "Deleted"),
+    ]
+    event_id = models.BigIntegerField(db_index=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # Stamped by the database so the feed's commit-lag check uses one clock.
+    changed_at = models.DateTimeField(db_default=Now())
+
+    @classmethod
+    def record(cls, event_id, action):
+        with transaction.atomic():
+            # Lock the event row so concurrent writers of one event replace its
+            # log row one after the other instead of leaving two (or none).
+            list(Event.objects.select_for_update().filter(id=event_id).values_list("id", flat=True))
+            cls.objects.filter(event_id=event_id).delete()
+            return cls.objects.create(event_id=event_id, action=action)
+
+    def __str__(self):
+        return f"{self.event_id} {self.action} (#{self.id})"
+
 
 class EventParticipant(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class EventCursorPagination(CursorPagination):
+    """
+    Keyset paging over the event list: each page is an `id > cursor` range
+    scan with no OFFSET and no COUNT(*), so deep pages cost the same as the
+    first one.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
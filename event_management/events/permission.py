@@ -1,11 +1,12 @@
 from rest_framework.permissions import SAFE_METHODS, BasePermission
+from.identity_map import get_identity_map
 from.models import Event
 
 class My_Permission(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in SAFE_METHODS:
             return True
-        return obj.host == request.user
+        return obj.host_id == request.user.id
 
 
     
@@ -15,7 +16,7 @@ class HostListPermission(BasePermission):
         if not event_id:
             return False
         try:
-            event = Event.objects.get(id=event_id)
-            return event.host == request.user
+            event = get_identity_map(request).get(Event, event_id)
+            return event.host_id == request.user.id
         except Event.DoesNotExist:
-            return False
\ No newline at end of file
+            return False
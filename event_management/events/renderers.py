@@ -0,0 +1,61 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for JSONRenderer that serializes with orjson.
+    Falls back to the standard library for indents orjson can't produce.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent not in (None, 2):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # DRF builds int-keyed dicts for ListField/DictField errors.
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=option)
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the standard library handles.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, like JSONRenderer does.
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = JSONRenderer.encoder_class
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        default = self.encoder_class().default
+        try:
+            return msgpack.packb(data, default=default, use_bin_type=True)
+        except (OverflowError, TypeError):
+            # MessagePack integers are limited to 64 bits; send wider ones as strings.
+            return msgpack.packb(_stringify_big_ints(data), default=default, use_bin_type=True)
+
+
+def _stringify_big_ints(data):
+    if isinstance(data, dict):
+        return {key: _stringify_big_ints(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_stringify_big_ints(value) for value in data]
+    if isinstance(data, int) and not isinstance(data, bool) and not -2 ** 63 <= data < 2 ** 64:
+        return str(data)
+    return data
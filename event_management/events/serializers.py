@@ -11,8 +11,28 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email']
 
-class EventSerializer(serializers.ModelSerializer):
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    A ModelSerializer that takes additional `fields` and `exclude` arguments
+    controlling which fields should be displayed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+        if exclude is not None:
+            for field_name in exclude:
+                self.fields.pop(field_name, None)
+
+
+class EventSerializer(DynamicFieldsModelSerializer):
     host = UserSerializer(read_only=True)
+    seats_remaining = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Event
@@ -42,6 +62,17 @@ class FeedbackSerializer(serializers.ModelSerializer):
         fields = '__all__'
         
         
+class BatchSubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    path = serializers.CharField()
+    body = serializers.JSONField(required=False)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = BatchSubRequestSerializer(many=True, allow_empty=False, max_length=20)
+    parallel = serializers.BooleanField(default=False)
+
+
 class RegisterSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
     email = serializers.EmailField(required=True)
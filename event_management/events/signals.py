@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from .models import Event, EventChange, EventParticipant
+from .streaming import publish_seat_availability
+
+
+@receiver(post_save, sender=Event)
+def record_event_saved(sender, instance, created, **kwargs):
+    EventChange.record(instance.id, "CREATED" if created else "UPDATED")
+
+
+@receiver(post_delete, sender=Event)
+def record_event_deleted(sender, instance, **kwargs):
+    EventChange.record(instance.id, "DELETED")
+
+
+@receiver(post_save, sender=EventParticipant)
+def increment_participant_count(sender, instance, created, **kwargs):
+    if created:
+        # Counter and change row commit together, so the change id versions the count.
+        with transaction.atomic():
+            Event.objects.filter(id=instance.event_id).update(
+                participant_count=F("participant_count") + 1, updated_at=now()
+            )
+            EventChange.record(instance.event_id, "UPDATED")
+        transaction.on_commit(lambda: publish_seat_availability(instance.event_id))
+
+
+@receiver(post_delete, sender=EventParticipant)
+def decrement_participant_count(sender, instance, **kwargs):
+    with transaction.atomic():
+        Event.objects.filter(id=instance.event_id).update(
+            participant_count=F("participant_count") - 1, updated_at=now()
+        )
+        EventChange.record(instance.event_id, "UPDATED")
+    transaction.on_commit(lambda: publish_seat_availability(instance.event_id))
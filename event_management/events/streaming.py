@@ -0,0 +1,162 @@
+import asyncio
+import re
+from urllib.parse import parse_qs
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .broadcast import get_backend
+from .models import Event, EventChange
+
+SEAT_STREAM_PATH = re.compile(r'^/api/events/(?P<event_id>\d+)/seats/stream/$')
+
+
+def seat_topic(event_id):
+    return f"event-seats:{event_id}"
+
+
+def seat_message(event_id, participant_count, max_participants, version):
+    return {
+        "event_id": event_id,
+        "participant_count": participant_count,
+        "seats_remaining": max(max_participants - participant_count, 0),
+        "version": version,
+    }
+
+
+def get_seat_counts(event_id):
+    """
+    Return (participant_count, max_participants, version) or None.
+    The version is the event's EventChange id, which is written in the same
+    transaction as every counter change and only ever grows.
+    """
+    version = EventChange.objects.filter(event_id=OuterRef('id')).values('id')[:1]
+    return (
+        Event.objects.filter(id=event_id)
+        .annotate(version=Coalesce(Subquery(version), 0))
+        .values_list('participant_count', 'max_participants', 'version')
+        .first()
+    )
+
+
+def publish_seat_availability(event_id):
+    """
+    Push the current participant count of `event_id` to stream subscribers.
+    """
+    backend = get_backend()
+    topic = seat_topic(event_id)
+    if not backend.has_subscribers(topic):
+        return
+    counts = get_seat_counts(event_id)
+    if counts is not None:
+        backend.publish(topic, seat_message(event_id, *counts), counts[-1])
+
+
+class SeatStreamRouter:
+    """
+    ASGI wrapper serving `api/events/<id>/seats/stream/` as server-sent events
+    and passing every other request to the Django application.
+
+    The stream is authenticated like the API (JWT access token of an active
+    user), from the Authorization header or a `token` query parameter
+    (EventSource cannot set headers). Idle connections get a keep-alive
+    comment.
+    """
+    keepalive_interval = 15
+
+    def __init__(self, application, backend=None):
+        self.application = application
+        self.backend = backend if backend is not None else get_backend()
+
+    async def __call__(self, scope, receive, send):
+        match = SEAT_STREAM_PATH.match(scope.get('path', '')) if scope['type'] == 'http' else None
+        if match is None:
+            return await self.application(scope, receive, send)
+        if scope['method'] != 'GET':
+            return await self.send_error(send, 405, "Method not allowed.")
+        if await self.authenticate(scope) is None:
+            return await self.send_error(send, 401, "Authentication credentials were not provided or are invalid.")
+
+        # Subscribe before reading the snapshot: a change committed in between
+        # then waits in the mailbox instead of being lost.
+        event_id = int(match['event_id'])
+        subscription = self.backend.subscribe(seat_topic(event_id))
+        counts = await sync_to_async(get_seat_counts)(event_id)
+        if counts is None:
+            self.backend.unsubscribe(subscription)
+            return await self.send_error(send, 404, "No event found")
+
+        await self.stream(subscription, seat_message(event_id, *counts), receive, send)
+
+    async def authenticate(self, scope):
+        """
+        Return the user for the request's access token, or None.
+        """
+        token = None
+        for name, value in scope.get('headers', []):
+            if name == b'authorization':
+                parts = value.decode('latin-1').split()
+                if len(parts) == 2 and parts[0] == 'Bearer':
+                    token = parts[1]
+        if token is None:
+            token = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('token', [None])[0]
+        if not token:
+            return None
+
+        authentication = JWTAuthentication()
+        try:
+            validated_token = authentication.get_validated_token(token.encode())
+            return await sync_to_async(authentication.get_user)(validated_token)
+        except AuthenticationFailed:
+            return None
+
+    async def stream(self, subscription, initial, receive, send):
+        """
+        Send `initial` (a seat_message), then every newer message the
+        subscription receives until the client disconnects.
+        """
+        subscription.skip_to(initial['version'])
+        disconnect = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        disconnect.add_done_callback(lambda _: subscription.close())
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            await send({'type': 'http.response.body', 'body': self.encode(initial), 'more_body': True})
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), self.keepalive_interval)
+                except asyncio.TimeoutError:
+                    await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+                    continue
+                if message is None:
+                    break
+                await send({'type': 'http.response.body', 'body': self.encode(message), 'more_body': True})
+        finally:
+            self.backend.unsubscribe(subscription)
+            disconnect.cancel()
+
+    async def wait_for_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    def encode(self, message):
+        return b'event: seats\ndata: ' + orjson.dumps(message) + b'\n\n'
+
+    async def send_error(self, send, status_code, error):
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': orjson.dumps({"error": error})})
@@ -1,3 +1,580 @@
-from django.test import TestCase
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+import msgpack
+import orjson
+import redis
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase
+from django.utils.timezone import now
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .broadcast import InProcessBackend, RedisBackend, Subscription
+from .identity_map import IdentityMap
+from .models import Event, EventChange, EventParticipant, Invitation
+from .renderers import MessagePackRenderer, ORJSONRenderer
+from .serializers import EventSerializer
+from .streaming import SeatStreamRouter, seat_message, seat_topic
+
+
+class EventTestCase(APITestCase):
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', email='host@example.com', password='Secret123!')
+        self.client.force_authenticate(self.host)
+
+    def create_event(self, **kwargs):
+        start = now() + timedelta(days=1)
+        defaults = {
+            'title': 'Meetup',
+            'description': 'x' * 10000,
+            'host': self.host,
+            'start_time': start,
+            'end_time': start + timedelta(hours=2),
+            'location': 'Berlin',
+            'max_participants': 10,
+        }
+        defaults.update(kwargs)
+        return Event.objects.create(**defaults)
+
+
+class SparseFieldsTests(EventTestCase):
+    def test_list_returns_only_requested_fields(self):
+        self.create_event()
+        response = self.client.get('/api/events/list/', {'fields': 'title,start_time'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['results'][0]), {'title', 'start_time'})
+
+    def test_list_does_not_select_excluded_columns(self):
+        self.create_event()
+        with self.assertNumQueries(2) as queries:
+            response = self.client.get('/api/events/list/', {'exclude': 'description,host'})
+        self.assertNotIn('description', response.data['results'][0])
+        self.assertNotIn('"description"', queries.captured_queries[-1]['sql'])
+        self.assertNotIn('auth_user', queries.captured_queries[-1]['sql'])
+
+    def test_detail_with_host_loads_host_in_same_query(self):
+        event = self.create_event()
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/events/{event.id}/', {'fields': 'title,host'})
+        self.assertEqual(response.data, {'title': 'Meetup', 'host': {'id': self.host.id, 'username': 'host', 'email': 'host@example.com'}})
+
+    def test_unknown_fields_are_rejected(self):
+        event = self.create_event()
+        response = self.client.get(f'/api/events/{event.id}/', {'fields': 'title,nope', 'exclude': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'fields': ['Unknown field(s): nope, bogus']})
+        self.assertEqual(self.client.get('/api/events/list/', {'fields': 'nope'}).status_code, 400)
+
+    def test_detail_without_params_returns_all_fields(self):
+        event = self.create_event()
+        response = self.client.get(f'/api/events/{event.id}/')
+        self.assertIn('description', response.data)
+        self.assertIn('host', response.data)
+
+
+class RendererTests(EventTestCase):
+    def test_orjson_output_matches_json_renderer(self):
+        data = EventSerializer([self.create_event(title='caf\u00e9')], many=True).data
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_orjson_renders_list_field_errors(self):
+        serializer = serializers.Serializer()
+        serializer.fields['ids'] = serializers.ListField(child=serializers.IntegerField())
+        serializer.initial_data = {'ids': [1, 'x']}
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(ORJSONRenderer().render(serializer.errors), JSONRenderer().render(serializer.errors))
+
+    def test_orjson_falls_back_for_big_integers(self):
+        data = {'value': 2 ** 70}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_msgpack_sends_big_integers_as_strings(self):
+        data = {'value': 2 ** 70, 'small': [1, -2 ** 70]}
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render(data)),
+            {'value': str(2 ** 70), 'small': [1, str(-2 ** 70)]},
+        )
+
+    def test_msgpack_request_and_response(self):
+        start = now() + timedelta(days=1)
+        payload = {
+            'title': 'Meetup', 'description': 'Talks', 'location': 'Berlin', 'max_participants': 10,
+            'start_time': start.isoformat(), 'end_time': (start + timedelta(hours=1)).isoformat(),
+        }
+        response = self.client.post('/api/create-events/', payload, format='msgpack', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)['title'], 'Meetup')
+
+
+class BatchTests(EventTestCase):
+    def test_dashboard_calls_in_one_request(self):
+        event = self.create_event()
+        guest = User.objects.create_user(username='guest', password='Secret123!')
+        EventParticipant.objects.create(event=event, user=guest)
+        Invitation.objects.create(event=event, inviter=self.host, invitee=guest)
+
+        response = self.client.post('/api/batch/', {'requests': [
+            {'path': f'events/{event.id}/?fields=title'},
+            {'path': f'/api/events/{event.id}/participants/'},
+            {'path': 'list-invitations/'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        first, second, third = response.data['responses']
+        self.assertEqual(first, {'status': 200, 'body': {'title': 'Meetup'}})
+        self.assertEqual(len(second['body']['participants']), 1)
+        self.assertEqual(third['body'][0]['status'], 'PENDING')
+
+    def test_sub_requests_keep_their_permissions(self):
+        other = User.objects.create_user(username='other', password='Secret123!')
+        event = self.create_event(host=other)
+        response = self.client.post('/api/batch/', {'requests': [
+            {'method': 'PATCH', 'path': f'events/{event.id}/', 'body': {'title': 'Hijacked'}},
+            {'path': f'events/{event.id}/participants/'},
+            {'path': 'no-such-route/'},
+            {'method': 'POST', 'path': 'batch/', 'body': {}},
+        ]}, format='json')
+
+        statuses = [result['status'] for result in response.data['responses']]
+        self.assertEqual(statuses, [403, 403, 404, 400])
+        event.refresh_from_db()
+        self.assertEqual(event.title, 'Meetup')
+
+    def test_update_by_non_host_is_forbidden(self):
+        event = self.create_event(host=User.objects.create_user(username='other'))
+        response = self.client.patch(f'/api/events/{event.id}/', {'title': 'Hijacked'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.delete(f'/api/events/{event.id}/').status_code, 403)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.post('/api/batch/', {'requests': [{'path': 'list-invitations/'}]}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+
+class ParallelBatchTests(TransactionTestCase):
+    def setUp(self):
+        host = User.objects.create_user(username='host', password='Secret123!')
+        self.client = APIClient()
+        self.client.force_authenticate(host)
+        start = now() + timedelta(days=1)
+        self.events = [
+            Event.objects.create(
+                title=f'Event {i}', description='', host=host, start_time=start,
+                end_time=start + timedelta(hours=1), location='Berlin', max_participants=10,
+            )
+            for i in range(3)
+        ]
+
+    def test_parallel_reads(self):
+        response = self.client.post('/api/batch/', {'parallel': True, 'requests': [
+            {'path': f'events/{event.id}/?fields=title'} for event in self.events
+        ]}, format='json')
+
+        self.assertEqual(
+            [result['body'] for result in response.data['responses']],
+            [{'title': f'Event {i}'} for i in range(3)],
+        )
+
+    def test_writes_are_applied_in_order(self):
+        event = self.events[0]
+        response = self.client.post('/api/batch/', {'parallel': True, 'requests': [
+            {'path': f'events/{event.id}/?fields=title'},
+            {'method': 'PATCH', 'path': f'events/{event.id}/', 'body': {'title': 'Renamed'}},
+            {'path': f'events/{event.id}/?fields=title'},
+            {'path': f'events/{event.id}/?fields=title'},
+            {'method': 'PATCH', 'path': f'events/{event.id}/', 'body': {'title': 'Renamed again'}},
+            {'path': f'events/{event.id}/?fields=title'},
+        ]}, format='json')
+
+        titles = [result['body']['title'] for result in response.data['responses']]
+        self.assertEqual(titles, ['Event 0', 'Renamed', 'Renamed', 'Renamed', 'Renamed again', 'Renamed again'])
+
+
+class IdentityMapTests(EventTestCase):
+    def test_loads_each_object_once(self):
+        event = self.create_event()
+        identity_map = IdentityMap()
+        identity_map.add(self.host)
+        with self.assertNumQueries(1):
+            first = identity_map.get(Event, event.id)
+            second = identity_map.get(Event, str(event.id))
+            self.assertIs(first.host, self.host)
+        self.assertIs(first, second)
+
+    def test_missing_object_is_remembered(self):
+        identity_map = IdentityMap()
+        with self.assertNumQueries(1):
+            self.assertIsNone(identity_map.get_or_none(Event, 999))
+            with self.assertRaises(Event.DoesNotExist):
+                identity_map.get(Event, 999)
+
+    def test_participants_list_loads_event_once(self):
+        event = self.create_event()
+        for name in ('a', 'b', 'c'):
+            EventParticipant.objects.create(event=event, user=User.objects.create_user(username=name))
+        # One query for the event (shared with HostListPermission), one for the participants.
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/events/{event.id}/participants/')
+        self.assertEqual(len(response.data['participants']), 3)
+
+    def test_send_invitation_does_not_reload_event_or_host(self):
+        event = self.create_event()
+        guest = User.objects.create_user(username='guest')
+        with self.assertNumQueries(6) as queries:
+            response = self.client.post(f'/api/events/{event.id}/invite/', {'invitee': guest.id}, format='json')
+        self.assertEqual(response.status_code, 201)
+        event_selects = [q for q in queries.captured_queries if q['sql'].startswith('SELECT') and 'FROM "events_event"' in q['sql']]
+        self.assertEqual(len(event_selects), 1)
+
+    def test_update_reuses_request_user_as_host(self):
+        event = self.create_event()
+        # The event SELECT (no user join) and the UPDATE, then the change-feed entry:
+        # savepoint, event row lock, DELETE, INSERT, release.
+        with self.assertNumQueries(7) as queries:
+            response = self.client.patch(f'/api/events/{event.id}/', {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['host']['username'], 'host')
+        self.assertNotIn('auth_user', queries.captured_queries[0]['sql'])
+
+    def test_detail_loads_event_and_host_once(self):
+        own = self.create_event()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f'/api/events/{own.id}/').data['host']['id'], self.host.id)
+
+        other = User.objects.create_user(username='other')
+        foreign = self.create_event(host=other)
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(f'/api/events/{foreign.id}/').data['host']['id'], other.id)
+
+    def test_detail_missing_event(self):
+        self.assertEqual(self.client.get('/api/events/999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/events/999/', {'fields': 'title'}).status_code, 404)
+
+
+class SeatAvailabilityTests(EventTestCase):
+    def test_counter_follows_registrations(self):
+        event = self.create_event(max_participants=1)
+        guest = User.objects.create_user(username='guest')
+        participant = EventParticipant.objects.create(event=event, user=guest)
+        event.refresh_from_db()
+        self.assertEqual((event.participant_count, event.seats_remaining), (1, 0))
+
+        participant.delete()
+        event.refresh_from_db()
+        self.assertEqual((event.participant_count, event.seats_remaining), (0, 1))
+
+    def test_saving_stale_instance_keeps_counter(self):
+        event = self.create_event()
+        stale = Event.objects.get(id=event.id)
+        EventParticipant.objects.create(event=event, user=User.objects.create_user(username='guest'))
+
+        stale.title = 'Renamed'
+        stale.save()
+        event.refresh_from_db()
+        self.assertEqual((event.title, event.participant_count), ('Renamed', 1))
+
+    def test_serializer_update_of_stale_instance_keeps_counter(self):
+        event = self.create_event()
+        stale = Event.objects.get(id=event.id)
+        EventParticipant.objects.create(event=event, user=User.objects.create_user(username='guest'))
+
+        serializer = EventSerializer(stale, data={'title': 'Renamed'}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        event.refresh_from_db()
+        self.assertEqual(event.participant_count, 1)
+
+    def test_register_rejects_full_event(self):
+        event = self.create_event(max_participants=1)
+        self.assertEqual(self.client.post(f'/api/events/{event.id}/register/').status_code, 201)
+        self.client.force_authenticate(User.objects.create_user(username='late'))
+        self.assertEqual(self.client.post(f'/api/events/{event.id}/register/').status_code, 400)
+
+    def test_list_exposes_seats_and_filters_available(self):
+        full = self.create_event(title='Full', max_participants=1)
+        EventParticipant.objects.create(event=full, user=User.objects.create_user(username='guest'))
+        self.create_event(title='Open', max_participants=5)
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/events/list/', {'available': 'true', 'fields': 'title,participant_count,seats_remaining'})
+        self.assertEqual(response.data['results'], [{'title': 'Open', 'participant_count': 0, 'seats_remaining': 5}])
+
+        response = self.client.get('/api/events/list/', {'available': 'false', 'fields': 'title'})
+        self.assertEqual(response.data['results'], [{'title': 'Full'}])
+
+    def test_cursor_paging_over_available_events(self):
+        full = self.create_event(title='Full', max_participants=1)
+        EventParticipant.objects.create(event=full, user=User.objects.create_user(username='guest'))
+        for i in range(3):
+            self.create_event(title=f'Open {i}')
+
+        params = {'pagination': 'cursor', 'available': 'true', 'fields': 'title'}
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get('/api/events/list/', params)
+        self.assertNotIn('COUNT', queries.captured_queries[0]['sql'])
+        self.assertNotIn('OFFSET', queries.captured_queries[0]['sql'])
+        self.assertEqual(response.data['results'], [{'title': 'Open 0'}, {'title': 'Open 1'}])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'], [{'title': 'Open 2'}])
+        self.assertIsNone(response.data['next'])
+
+
+class EventChangesTests(EventTestCase):
+    def settle(self):
+        # Move every change past the feed's commit-lag window.
+        EventChange.objects.update(changed_at=now() - timedelta(minutes=1))
+
+    def sync(self, since, settle=True):
+        if settle:
+            self.settle()
+        response = self.client.get('/api/events/changes/', {'since': since})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_feed_returns_only_changes_after_cursor(self):
+        kept = self.create_event(title='Kept')
+        dropped = self.create_event(title='Dropped')
+        first = self.sync(0)
+        self.assertEqual([(c['id'], c['action']) for c in first['changes']], [(kept.id, 'CREATED'), (dropped.id, 'CREATED')])
+        self.assertEqual(self.sync(first['next'])['changes'], [])
+
+        EventParticipant.objects.create(event=kept, user=User.objects.create_user(username='guest'))
+        dropped_id = dropped.id
+        dropped.delete()
+        second = self.sync(first['next'])
+        self.assertEqual(
+            [(c['id'], c['action']) for c in second['changes']], [(kept.id, 'UPDATED'), (dropped_id, 'DELETED')]
+        )
+        self.assertEqual(second['changes'][0]['event']['participant_count'], 1)
+        self.assertIsNone(second['changes'][1]['event'])
+
+    def test_log_keeps_one_row_per_event(self):
+        event = self.create_event()
+        for title in ('a', 'b', 'c'):
+            event.title = title
+            event.save()
+        self.assertEqual(EventChange.objects.filter(event_id=event.id).count(), 1)
+
+    def test_paging_and_invalid_cursor(self):
+        for i in range(3):
+            self.create_event(title=f'Event {i}')
+        self.settle()
+        response = self.client.get('/api/events/changes/', {'since': 0, 'limit': 2})
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(len(self.sync(response.data['next'])['changes']), 1)
+        self.assertEqual(self.client.get('/api/events/changes/', {'since': 'abc'}).status_code, 400)
+
+    def test_recent_changes_are_held_back(self):
+        settled = self.create_event(title='Settled')
+        self.settle()
+        self.create_event(title='Fresh')
+
+        held = self.sync(0, settle=False)
+        self.assertEqual([c['id'] for c in held['changes']], [settled.id])
+        self.assertEqual(self.sync(held['next'], settle=False)['changes'], [])
+        self.assertEqual([c['event']['title'] for c in self.sync(held['next'])['changes']], ['Fresh'])
+
+
+class SeatStreamTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = InProcessBackend()
+        self.router = SeatStreamRouter(application=None, backend=self.backend)
+
+    def open_stream(self, path, token=None, on_first_message=None):
+        sent = []
+
+        async def run():
+            disconnected = asyncio.Event()
+            first_message = asyncio.Event()
+
+            async def receive():
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+                if message.get('more_body'):
+                    first_message.set()
+
+            headers = [(b'authorization', f'Bearer {token}'.encode())] if token else []
+            scope = {'type': 'http', 'method': 'GET', 'path': path, 'headers': headers, 'query_string': b''}
+            task = asyncio.ensure_future(self.router(scope, receive, send))
+            done, _ = await asyncio.wait([task, asyncio.ensure_future(first_message.wait())], return_when=asyncio.FIRST_COMPLETED)
+            if task not in done:
+                if on_first_message:
+                    await on_first_message()
+                disconnected.set()
+            await task
+
+        async_to_sync(run)()
+        return sent
+
+    def version(self, event):
+        return EventChange.objects.get(event_id=event.id).id
+
+    def test_rejects_missing_token(self):
+        sent = self.open_stream('/api/events/1/seats/stream/')
+        self.assertEqual(sent[0]['status'], 401)
+
+    def test_rejects_inactive_user(self):
+        event = self.create_event()
+        token = AccessToken.for_user(self.host)
+        User.objects.filter(id=self.host.id).update(is_active=False)
+        sent = self.open_stream(f'/api/events/{event.id}/seats/stream/', token)
+        self.assertEqual(sent[0]['status'], 401)
+
+    def test_unknown_event(self):
+        sent = self.open_stream('/api/events/999/seats/stream/', token=AccessToken.for_user(self.host))
+        self.assertEqual(sent[0]['status'], 404)
+        self.assertFalse(self.backend.has_subscribers(seat_topic(999)))
+
+    def test_streams_snapshot_then_newest_update_only(self):
+        event = self.create_event(max_participants=3)
+        version = self.version(event)
+
+        async def register_out_of_order():
+            # Three publishes land before the loop flushes, the newest in the middle.
+            self.backend.publish(seat_topic(event.id), seat_message(event.id, 1, 3, version + 1), version + 1)
+            self.backend.publish(seat_topic(event.id), seat_message(event.id, 2, 3, version + 2), version + 2)
+            self.backend.publish(seat_topic(event.id), seat_message(event.id, 1, 3, version + 1), version + 1)
+            await asyncio.sleep(0.05)
+            # A late publish of an older state after delivery is dropped too.
+            self.backend.publish(seat_topic(event.id), seat_message(event.id, 1, 3, version + 1), version + 1)
+            await asyncio.sleep(0.05)
+
+        sent = self.open_stream(f'/api/events/{event.id}/seats/stream/', AccessToken.for_user(self.host), register_out_of_order)
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        bodies = [message['body'] for message in sent[1:]]
+        self.assertEqual(bodies, [
+            self.router.encode(seat_message(event.id, 0, 3, version)),
+            self.router.encode(seat_message(event.id, 2, 3, version + 2)),
+        ])
+        self.assertFalse(self.backend.has_subscribers(seat_topic(event.id)))
+
+    def test_snapshot_keeps_only_newer_pending_change(self):
+        async def run():
+            subscription = Subscription('topic')
+            subscription.push('between subscribe and snapshot', 5)
+            subscription.skip_to(4)
+            self.assertEqual(await subscription.get(), 'between subscribe and snapshot')
+
+            subscription.push('already in snapshot', 6)
+            subscription.skip_to(6)
+            subscription.close()
+            self.assertIsNone(await subscription.get())
+
+        asyncio.run(run())
+
+    def test_registration_is_published_on_commit(self):
+        event = self.create_event(max_participants=3)
+        guest = User.objects.create_user(username='guest')
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        async def subscribe():
+            return self.backend.subscribe(seat_topic(event.id))
+
+        subscription = loop.run_until_complete(subscribe())
+        self.client.force_authenticate(guest)
+        with patch('events.streaming.get_backend', return_value=self.backend):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(f'/api/events/{event.id}/register/')
+        self.assertEqual(response.status_code, 201)
+
+        message = loop.run_until_complete(asyncio.wait_for(subscription.get(), 1))
+        self.assertEqual(message, seat_message(event.id, 1, 3, self.version(event)))
+
+
+class FakeRedisPubSub:
+    def __init__(self, messages, fail=False):
+        self.messages = messages
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def psubscribe(self, pattern):
+        if self.fail:
+            raise redis.ConnectionError("connection reset")
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        await asyncio.Event().wait()
+
+
+class FakeAsyncRedis:
+    def __init__(self, messages=(), fail=False):
+        self.pubsub_instance = FakeRedisPubSub(list(messages), fail)
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+        return False
+
+    def pubsub(self):
+        return self.pubsub_instance
+
+
+class RedisBackendTests(TestCase):
+    def setUp(self):
+        patcher = patch('events.broadcast.redis.Redis.from_url')
+        self.from_url = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = RedisBackend()
+        self.backend.reconnect_delay = 0
+
+    def test_client_has_timeouts(self):
+        kwargs = self.from_url.call_args.kwargs
+        self.assertEqual(kwargs['socket_timeout'], RedisBackend.socket_timeout)
+        self.assertEqual(kwargs['socket_connect_timeout'], RedisBackend.socket_timeout)
+
+    def test_publish_sends_versioned_message(self):
+        self.backend.publish('event-seats:1', {'participant_count': 2}, 7)
+        self.from_url.return_value.publish.assert_called_once_with(
+            'events:event-seats:1', orjson.dumps(['event-seats:1', {'participant_count': 2}, 7])
+        )
+
+    def test_publish_failure_does_not_raise(self):
+        self.from_url.return_value.publish.side_effect = redis.ConnectionError("down")
+        with self.assertLogs('events.broadcast', 'ERROR'):
+            self.backend.publish('event-seats:1', {}, 1)
+
+    def test_listener_survives_errors_and_delivers(self):
+        broken = FakeAsyncRedis(fail=True)
+        working = FakeAsyncRedis([
+            {'type': 'psubscribe', 'data': 1},
+            {'type': 'pmessage', 'data': b'not json'},
+            {'type': 'pmessage', 'data': orjson.dumps(['event-seats:1', {'participant_count': 3}, 9])},
+        ])
+
+        async def run():
+            subscription = self.backend.subscribe('event-seats:1')
+            message = await asyncio.wait_for(subscription.get(), 1)
+            self.backend._listener.cancel()
+            return message
+
+        with patch('events.broadcast.redis.asyncio.Redis.from_url', side_effect=[broken, working]):
+            with self.assertLogs('events.broadcast', 'ERROR') as logs:
+                message = asyncio.run(run())
+
+        self.assertEqual(message, {'participant_count': 3})
+        self.assertTrue(broken.closed)
+        self.assertIn('reconnecting', logs.output[0])
+        self.assertIn('malformed', logs.output[1])
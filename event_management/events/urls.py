@@ -2,13 +2,14 @@ from django.urls import path
 
 from .views import (EventListCreateView, LoginView, RegisterView,
                     EventRetrieveUpdateDestroyView, EventParticipantCreate
-                    , EventParticipantsList, SendInvitationView, ListInvitationsView ,RespondInvitationView )
+                    , EventParticipantsList, SendInvitationView, ListInvitationsView ,RespondInvitationView, BatchView, EventChangesView )
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
     path("create-events/", EventListCreateView.as_view(), name="event-create"),
     path("events/list/", EventListCreateView.as_view(), name="event-list"),
+    path("events/changes/", EventChangesView.as_view(), name="event-changes"),
     path(
         "events/<int:id>/",
         EventRetrieveUpdateDestroyView.as_view(),
@@ -20,5 +21,6 @@ urlpatterns = [
     path('events/<int:event_id>/invite/', SendInvitationView.as_view(), name='event-invitation'),
     path('list-invitations/', ListInvitationsView.as_view(), name='invitations'),
     path("check-status/<int:event_id>/",RespondInvitationView.as_view(),name='invitation-status'),
+    path("batch/", BatchView.as_view(), name="batch"),
 
 ]
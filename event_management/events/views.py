@@ -1,17 +1,32 @@
+import io
+from datetime import timedelta
+from itertools import takewhile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import orjson
+from django.db import connections
+from django.db.models import BooleanField, ExpressionWrapper, F, Q
+from django.db.models.functions import Now
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.contrib.auth.models import User
-from .models import Event, EventParticipant, Invitation
+from .models import Event, EventChange, EventParticipant, Invitation
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.permissions import IsAuthenticated
-from .serializers import EventSerializer ,RegisterSerializer, EventParticipantSerializer, InvitationSerializer
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from .serializers import EventSerializer ,RegisterSerializer, EventParticipantSerializer, InvitationSerializer, BatchRequestSerializer
 from django.contrib.auth import authenticate
 from django.contrib.auth.hashers import make_password
 from django.utils.timezone import now 
 from rest_framework.pagination import PageNumberPagination  
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView, ListAPIView
 from . permission import My_Permission ,HostListPermission
+from .identity_map import get_identity_map
+from .pagination import EventCursorPagination
 
 
 class RegisterView(APIView):
@@ -56,11 +71,73 @@ class LoginView(APIView):
         
 
 
-class EventListCreateView(ListCreateAPIView):
+class SparseFieldsMixin:
+    """
+    Lets GET requests trim the response with `?fields=a,b` or `?exclude=a,b`.
+    The same selection is pushed down to the SQL column list via only(), so
+    e.g. the unbounded `description` column is not read when not requested.
+    """
+
+    def _get_query_param_list(self, name):
+        value = self.request.query_params.get(name, '')
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            if self.request.method in SAFE_METHODS:
+                fields = self._get_query_param_list('fields')
+                exclude = self._get_query_param_list('exclude')
+                if fields or exclude:
+                    available = self.get_serializer_class()().fields
+                    unknown = [name for name in fields + exclude if name not in available]
+                    if unknown:
+                        raise ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown)}"]})
+                    self._sparse_fields = [
+                        name for name in available
+                        if (not fields or name in fields) and name not in exclude
+                    ]
+        return self._sparse_fields
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Validate here so a bad selection is a 400, not a 500 from the handlers' catch-alls.
+        self.get_sparse_fields()
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def load_only_requested_columns(self, queryset):
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset.select_related('host')
+
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        only = ['id'] + [name for name in fields if name in columns]
+        if 'seats_remaining' in fields:
+            only += ['max_participants', 'participant_count']
+        if 'host' in fields:
+            only += ['host__username', 'host__email']
+            queryset = queryset.select_related('host')
+        return queryset.only(*only)
+
+
+class EventListCreateView(SparseFieldsMixin, ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = EventSerializer
     pagination_class = PageNumberPagination
 
+    @property
+    def paginator(self):
+        # `?pagination=cursor` opts into keyset paging; page numbers stay the default.
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = EventCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
 
     def post(self, request):
         try:
@@ -87,7 +164,7 @@ class EventListCreateView(ListCreateAPIView):
     def get_queryset(self):
         
         try:
-            events = Event.objects.all()
+            events = self.load_only_requested_columns(Event.objects.all())
 
             host = self.request.query_params.get('host')
             if host:
@@ -102,23 +179,44 @@ class EventListCreateView(ListCreateAPIView):
             if location:
                 events = events.filter(location__icontains=location)
 
-            return events
+            available = self.request.query_params.get('available')
+            if available == 'true':
+                events = events.filter(participant_count__lt=F('max_participants'))
+            elif available == 'false':
+                events = events.filter(participant_count__gte=F('max_participants'))
+
+            return events.order_by('id')
 
         except Exception as e:
             return Response(
                 {"error": f"Could not fetch events: {str(e)}"},status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
-class EventRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class EventRetrieveUpdateDestroyView(SparseFieldsMixin, RetrieveUpdateDestroyAPIView):
     
     permission_classes = [IsAuthenticated, My_Permission]
     serializer_class = EventSerializer
     queryset = Event.objects.all()
     lookup_field = "id"
 
+    def get_queryset(self):
+        return self.load_only_requested_columns(super().get_queryset())
+
+    def get_object(self):
+        # Partially loaded (sparse) instances must not end up in the shared map.
+        # Both branches raise Event.DoesNotExist, which the handlers turn into a 404.
+        event_id = self.kwargs[self.lookup_field]
+        if self.get_sparse_fields() is not None:
+            event = self.get_queryset().get(id=event_id)
+        else:
+            identity_map = get_identity_map(self.request)
+            event = identity_map.load_related(identity_map.get(Event, event_id), 'host')
+        self.check_object_permissions(self.request, event)
+        return event
+
     def retrieve(self, request, *args, **kwargs):
         try:
             event = self.get_object()
-            serializer = EventSerializer(event)
+            serializer = self.get_serializer(event)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         except Event.DoesNotExist:
@@ -140,6 +238,9 @@ class EventRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         except Event.DoesNotExist:
             return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        except PermissionDenied:
+            raise
+
         except Exception as e:
             return Response({"error": f"Something went wrong: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -147,9 +248,13 @@ class EventRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     def delete(self, request, *args, **kwargs):
         try:
             event = self.get_object()  
+            get_identity_map(request).discard(Event, event.id)
             event.delete()
             return Response({"message": "Event deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
         
+        except PermissionDenied:
+            raise
+
         except Exception as e:
             return Response({"error": f"There is No Event Exists for that Host: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -160,11 +265,11 @@ class EventParticipantCreate(APIView):
         user = request.user
         print("-----user",user.username ,"event_id---",event_id)
         
-        event = Event.objects.filter(id=event_id).first()
+        event = get_identity_map(request).get_or_none(Event, event_id)
         if not event:
             return Response({"error": "No event found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if event.max_participants <= event.eventparticipant_set.count():
+        if event.max_participants <= event.participant_count:
             return Response({"error": "Event is full"}, status=status.HTTP_400_BAD_REQUEST)
 
         if EventParticipant.objects.filter(event=event, user=user).count() > 0:
@@ -181,14 +286,14 @@ class EventParticipantsList(APIView):
     permission_classes = [IsAuthenticated,HostListPermission]
     def get(self, request, event_id):
         try:
-            event = Event.objects.get(id=event_id)
+            event = get_identity_map(request).get(Event, event_id)
             print("----->event",event)
         except Event.DoesNotExist:
             return Response({"error": "No event found"}, status=status.HTTP_404_NOT_FOUND)
 
         try:
            
-            participants = EventParticipant.objects.filter(event=event)
+            participants = EventParticipant.objects.filter(event=event).select_related('user')
             
             serializer = EventParticipantSerializer(participants, many=True)
 
@@ -208,11 +313,11 @@ class SendInvitationView(APIView):
     def post(self, request, event_id):
         user = request.user
         print(user.username)
-        event = Event.objects.filter(id=event_id).first()
+        event = get_identity_map(request).get_or_none(Event, event_id)
         if not event:
             return Response({"error": "No event found"}, status=status.HTTP_404_NOT_FOUND)
     
-        if request.user != event.host:
+        if request.user.id != event.host_id:
             return Response({"error": "Only the event host can send invitations."}, status=status.HTTP_403_FORBIDDEN)
         
         invitee_id = request.data.get("invitee")
@@ -242,7 +347,7 @@ class ListInvitationsView(APIView):
             return Response(
                 {"error": "Only event hosts can access this list."}
             )
-        invitations = Invitation.objects.filter(event__in=hosted_events, status="PENDING")
+        invitations = Invitation.objects.filter(event__in=hosted_events, status="PENDING").select_related('inviter', 'invitee')
         print("----->invitations",invitations)
         serializer = InvitationSerializer(invitations, many=True)
         
@@ -277,15 +382,134 @@ class RespondInvitationView(APIView):
         return Response(InvitationSerializer(invitation).data, status=status.HTTP_200_OK)
 
 
+class EventChangesView(APIView):
+    """
+    Delta-sync feed: events created, updated or deleted after the `since`
+    cursor, oldest first. Clients store `next` and pass it back as `since`.
 
+    A change row becomes visible when its transaction commits, which can be
+    after a row with a higher id. Rows younger than `commit_lag` are held
+    back, so the cursor never moves past a row that may still be in flight.
+    `commit_lag` must exceed the longest transaction that writes events.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 100
+    max_limit = 1000
+    commit_lag = timedelta(seconds=5)
 
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response({"error": "since and limit must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.max_limit))
+
+        # `settled` is computed against the database clock, the same clock that
+        # stamped changed_at, so skew between app servers can't shrink the lag.
+        settled = ExpressionWrapper(Q(changed_at__lte=Now() - self.commit_lag), output_field=BooleanField())
+        changes = EventChange.objects.filter(id__gt=since).annotate(settled=settled).order_by('id')[:limit + 1]
+        # Stop at the first row inside the lag window: everything after it is
+        # newer and may have lower-id neighbours that are not committed yet.
+        changes = list(takewhile(lambda change: change.settled, changes))
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        live_ids = [change.event_id for change in changes if change.action != "DELETED"]
+        events = Event.objects.filter(id__in=live_ids).select_related('host')
+        serialized = {event['id']: event for event in EventSerializer(events, many=True).data}
+
+        results = []
+        for change in changes:
+            event = serialized.get(change.event_id)
+            action = change.action if event is not None else "DELETED"
+            results.append({"id": change.event_id, "action": action, "event": event})
+
+        return Response({
+            "changes": results,
+            "next": str(changes[-1].id if changes else since),
+            "has_more": has_more,
+        }, status=status.HTTP_200_OK)
+
+
+class BatchView(APIView):
+    """
+    Runs several `events.urls` requests in one round-trip, authenticated once.
+
+    Each sub-request still goes through its view's permission checks. With
+    `parallel`, consecutive read-only sub-requests run concurrently; writes
+    always run alone and in order.
+    """
+    permission_classes = [IsAuthenticated]
+    max_workers = 4
 
+    def post(self, request):
+        serializer = BatchRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        sub_requests = serializer.validated_data['requests']
+        if not serializer.validated_data['parallel']:
+            results = [self.run_sub_request(request, sub) for sub in sub_requests]
+            return Response({"responses": results}, status=status.HTTP_200_OK)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            reads = []
+            for sub in sub_requests + [None]:
+                if sub is not None and sub['method'] in SAFE_METHODS:
+                    reads.append(sub)
+                    continue
+                results += executor.map(lambda read: self.run_threaded_sub_request(request, read), reads)
+                reads = []
+                if sub is not None:
+                    results.append(self.run_sub_request(request, sub))
+        return Response({"responses": results}, status=status.HTTP_200_OK)
+
+    def run_threaded_sub_request(self, request, sub):
+        try:
+            return self.run_sub_request(request, sub)
+        finally:
+            # Worker threads get their own DB connections; don't leak them.
+            connections.close_all()
 
+    def run_sub_request(self, request, sub):
+        url = urlsplit(sub['path'])
+        path = url.path.lstrip('/')
+        if path.startswith('api/'):
+            path = path[len('api/'):]
 
+        try:
+            match = resolve('/' + path, urlconf='events.urls')
+        except Resolver404:
+            return {"status": status.HTTP_404_NOT_FOUND, "body": {"error": "Not found"}}
+        if match.func.view_class is BatchView:
+            return {"status": status.HTTP_400_BAD_REQUEST, "body": {"error": "Batch requests cannot be nested."}}
 
-
-
-
-
-
+        sub_request = self.build_sub_request(request, sub['method'], '/api/' + path, url.query, sub.get('body'))
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except Exception as e:
+            return {"status": status.HTTP_500_INTERNAL_SERVER_ERROR, "body": {"error": f"Something went wrong: {str(e)}"}}
+        return {"status": response.status_code, "body": getattr(response, 'data', None)}
+
+    def build_sub_request(self, request, method, path, query, body):
+        sub_request = HttpRequest()
+        sub_request.method = method
+        sub_request.path = sub_request.path_info = path
+        sub_request.META = {
+            key: value for key, value in request.META.items()
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH', 'QUERY_STRING', 'HTTP_ACCEPT')
+        }
+        sub_request.META.update(REQUEST_METHOD=method, PATH_INFO=path, QUERY_STRING=query, HTTP_ACCEPT='application/json')
+        sub_request.GET = QueryDict(query)
+
+        content = orjson.dumps(body) if body is not None else b''
+        sub_request.META.update(CONTENT_TYPE='application/json', CONTENT_LENGTH=str(len(content)))
+        sub_request._stream = io.BytesIO(content)
+        sub_request._read_started = False
+
+        # Reuse the identity the batch request was authenticated with.
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        return sub_request